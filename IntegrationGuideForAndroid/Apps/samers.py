@@ -11,19 +11,45 @@
 # Reference: https://docs.python.org/3/library/argparse.html
 import argparse
 #
+# Module for running tasks in a pool of threads.
+# https://docs.python.org/3/library/concurrent.futures.html
+from concurrent.futures import ThreadPoolExecutor
+#
 # Sequence comparison module.
 # https://docs.python.org/3/library/difflib.html#difflib.context_diff
 from difflib import context_diff
 #
-# Module for old school paths. Only used to get commonpath(), which doesn't have
-# an equivalent in OO paths.
-# https://docs.python.org/3/library/os.path.html
-import os.path
+# File comparison module, used for a quick equality test before diffing.
+# https://docs.python.org/3/library/filecmp.html
+import filecmp
+#
+# Module for iterator building blocks. Only used to chain differences.
+# https://docs.python.org/3/library/itertools.html#itertools.chain
+from itertools import chain
+#
+# JSON module, used for the notice check cache file.
+# https://docs.python.org/3/library/json.html
+import json
+#
+# Module for operating system interfaces. Only used for the following.
+#
+# -   Walking the directory tree once, with walk(), fspath(), and sep.
+# -   Decoding Git output, with fsdecode().
+# -   Making notice cache keys, with path.relpath().
+# -   Sizing the diff_all thread pool, with cpu_count().
+#
+# https://docs.python.org/3/library/os.html
+import os
 #
 # Module for OO path handling.
 # https://docs.python.org/3/library/pathlib.html
 from pathlib import Path
 #
+# Regular expressions module, used to match glob patterns against the paths
+# found by walking the directory tree.
+# https://docs.python.org/3/library/re.html
+import re
+#
 # Module for file and directory handling.
 # https://docs.python.org/3.5/library/shutil.html
 import shutil
@@ -44,19 +70,11 @@ from tempfile import NamedTemporaryFile
 # Only used for --help description.
 # https://docs.python.org/3/library/textwrap.html
 import textwrap
-
-def glob_each(path, patterns):
-    for pattern in patterns:
-        matches = []
-        for match in path.glob(pattern):
-            matches.append(match)
-            yield match
-
-        if len(matches) == 0:
-            raise ValueError(f'Failed, no match for "{pattern}".')
-        if len(matches) == 1:
-            raise ValueError(
-                f'Failed, only one match for "{pattern}": {matches[0]}.')
+#
+# Module for thread locks. Only used to make Rules caches safe for the worker
+# threads in diff_all.
+# https://docs.python.org/3/library/threading.html#rlock-objects
+import threading
 
 class Rules:
 
@@ -183,6 +201,22 @@ class Rules:
     def __init__(self, topPath):
         super()
         self._topPath = topPath
+        # Glob results are cached by pattern, so that each pattern is globbed
+        # at most once per run, however many originals are checked against it.
+        self._globCache = {}
+        self._groupCache = {}
+        # Compiled pattern table, used to classify a path without globbing.
+        self._compiledPatterns = None
+        # Rather than each pattern walking the directory tree, the tree is
+        # walked once, on first use, and every pattern is matched against the
+        # list of paths found. Paths are held as relative path strings with /
+        # separators. A Path object is only made for a path that matches.
+        self._allRelStrs = None
+        # The caches are filled on demand, from diff_all worker threads too. The
+        # lock makes other threads wait for a walk, glob, or group that's in
+        # progress, instead of computing it again. It's reentrant because the
+        # group and glob methods call each other.
+        self._lock = threading.RLock()
 
     @classmethod
     def named_lists(cls):
@@ -192,24 +226,125 @@ class Rules:
         for description, patterns in cls.namedPatternLists.items():
             yield description, patterns
     
+    def _walk(self):
+        # Every root yielded by os.walk() starts with the top string, so the
+        # relative root is a slice of it, not a call to os.path.relpath().
+        with self._lock:
+            if self._allRelStrs is None:
+                top = os.fspath(self._topPath)
+                allRelStrs = []
+                for root, _, files in os.walk(top):
+                    relRoot = (
+                        root[len(top):].lstrip(os.sep).replace(os.sep, "/"))
+                    if relRoot != "":
+                        relRoot += "/"
+                    allRelStrs.extend(relRoot + name for name in files)
+                self._allRelStrs = allRelStrs
+            return self._allRelStrs
+
+    # Translate a glob pattern to a compiled regular expression that matches
+    # a relative path string like Path.glob() would, for the wildcards that
+    # the patterns use. Only these are supported:
+    #
+    # -   A ** component matches zero or more whole directories.
+    # -   A * or ? wildcard doesn't match across a / separator.
+    #
+    # Every other character matches only itself. That includes [ and ], so a
+    # character class like [ab] isn't supported and matches literally, unlike
+    # in Path.glob().
+    #
+    # The fnmatch module isn't used because its * wildcard does match across
+    # a / separator.
+    @staticmethod
+    def _pattern_regex(pattern):
+        regex = []
+        for part in pattern.split('/'):
+            if part == '**':
+                regex.append('(?:[^/]+/)*')
+                continue
+            for character in part:
+                if character == '*':
+                    regex.append('[^/]*')
+                elif character == '?':
+                    regex.append('[^/]')
+                else:
+                    regex.append(re.escape(character))
+            regex.append('/')
+        return re.compile(''.join(regex).rstrip('/') + r'\Z')
+
+    def _glob_pattern(self, pattern):
+        with self._lock:
+            matches = self._globCache.get(pattern)
+            if matches is None:
+                regex = self._pattern_regex(pattern)
+                matches = [
+                    Path(self._topPath, relStr) for relStr in self._walk()
+                    if regex.match(relStr)
+                ]
+                self._globCache[pattern] = matches
+            return matches
+
+    # Paths matched by a list of patterns, in pattern order. The list is cached
+    # by the patterns, so that a group is only assembled once however many
+    # times it's used, for example by several originals in the same group.
+    #
+    # Every pattern must match at least two paths. The check is made when the
+    # list is assembled, so a failing group raises before any path is used.
+    def globs_for(self, patterns):
+        key = tuple(patterns)
+        with self._lock:
+            paths = self._groupCache.get(key)
+            if paths is None:
+                paths = []
+                for pattern in patterns:
+                    matches = self._glob_pattern(pattern)
+                    if len(matches) == 0:
+                        raise ValueError(f'Failed, no match for "{pattern}".')
+                    if len(matches) == 1:
+                        raise ValueError(
+                            f'Failed, only one match for "{pattern}":'
+                            f' {matches[0]}.')
+                    paths.extend(matches)
+                self._groupCache[key] = paths
+            return paths
+
+    # Generator, so that a group's ValueError is raised when iteration starts,
+    # not when the generator is created.
+    def glob_each(self, patterns):
+        yield from self.globs_for(patterns)
+    
     def named_globs(self):
         for description, patterns in self.named_lists():
-            yield description, glob_each(self._topPath, patterns)
-
+            yield description, self.glob_each(patterns)
+
+    def _compiled_patterns(self):
+        if self._compiledPatterns is None:
+            self._compiledPatterns = [
+                (self._pattern_regex(pattern), description, patterns)
+                for description, patterns in self.named_lists()
+                for pattern in patterns
+            ]
+        return self._compiledPatterns
+
+    # Classify the target by matching its path, relative to the top, against
+    # every compiled pattern. Only the target itself is checked on the file
+    # system, so that a path that doesn't exist still gets no matches.
     def patterns_matched_by(self, targetPath):
-        for description, patterns in self.named_lists():
-            matched = False
-            for pattern in patterns:
-                for path in self._topPath.glob(pattern):
-                    if path == targetPath:
-                        matched = True
-                        break
-            if matched:
+        try:
+            relStr = targetPath.relative_to(self._topPath).as_posix()
+        except ValueError:
+            return
+        if not targetPath.is_file():
+            return
+
+        for regex, description, patterns in self._compiled_patterns():
+            if regex.match(relStr):
                 yield description, patterns
-                break
+                return
 
 # Jim had hoped to code the patterns_matched_by method without having to glob
-# out every pattern. It didn't work, see following transcript.
+# out every pattern. Path.match() didn't work, see following transcript, which
+# is why the patterns are translated to regular expressions by _pattern_regex.
 #
 #     $ python3
 #     Python 3.7.2 (v3.7.2:9a3ffc0492, Dec 24 2018, 02:44:43) 
@@ -228,31 +363,33 @@ class Rules:
 #     >>> ori.match('base*/**/styles.xml')
 #     False
 
-def diff_each(paths, pathLeft=None):
-
-    linesLeft = None
-    if pathLeft is not None:
-        with pathLeft.open() as file:
-            linesLeft = file.readlines()
-
-    for path in paths:
-        with path.open() as file:
-            lines = file.readlines()
-
-        if pathLeft is None:
-            pathLeft = path
-            linesLeft = lines
-            continue
-        
-        if path == pathLeft:
-            continue
-        
-        differences = [diff for diff in context_diff(
-            linesLeft, lines, fromfile=str(pathLeft), tofile=str(path)
-        )]
-        
-        yield pathLeft, path, differences if len(differences) > 0 else None
-
+# Differences between an original file and its edited copy, computed only on
+# first access.
+#
+# Notice insertion always adds lines, so the differences are never empty and
+# the object is always truthy. The original and edited files are only read,
+# and context_diff only run, if the differences are printed.
+class _LazyDiff:
+    def __init__(self, readLines, originalPath, editedPath):
+        self._readLines = readLines
+        self._originalPath = originalPath
+        self._editedPath = editedPath
+        self._differences = None
+
+    def __bool__(self):
+        return True
+
+    def __iter__(self):
+        if self._differences is None:
+            with self._editedPath.open() as file: editedLines = file.readlines()
+            self._differences = [diff for diff in context_diff(
+                self._readLines(self._originalPath), editedLines,
+                fromfile=str(self._originalPath), tofile="Edited"
+            )]
+        return iter(self._differences)
+
+    def __str__(self):
+        return ''.join(self)
 
 class NoticesEditor:
     _leader_suffixes_map = {
@@ -263,14 +400,33 @@ class NoticesEditor:
     _exempt_suffixes = ['.png']
 
     _custom_suffixes_map = {'.xml': 'xml_editor'}
+
+    # Inverse of the leader map, for lookup by suffix.
+    _suffix_to_lead = {
+        suffix: lead
+        for lead, suffixes in _leader_suffixes_map.items()
+        for suffix in suffixes
+    }
     
-    def __init__(self, noticesPath):
+    def __init__(self, noticesPath, readLines=None):
         self._noticesPath = Path(noticesPath)
+        # Custom editors resolved to bound methods, for lookup by suffix.
+        self._custom_editors = {
+            suffix: getattr(self, customEditorName)
+            for suffix, customEditorName in self._custom_suffixes_map.items()
+        }
+        self._readLines = (
+            self._read_lines_uncached if readLines is None else readLines)
         with self._noticesPath.open() as noticesFile: self._noticesLines = [
             line.strip() for line in noticesFile.readlines()]
+        self._noticesBytes = [line.encode() for line in self._noticesLines]
         self._noticesXML = "\n".join((
             "<!--", *["    " + line for line in self._noticesLines], "-->\n"))
 
+    @property
+    def noticesLines(self):
+        return self._noticesLines
+
     def check(self, path):
         path = Path(path)
         suffix = self._effective_suffix(path)
@@ -278,20 +434,20 @@ class NoticesEditor:
         if suffix in self._exempt_suffixes:
             return True, None
 
-        linesFound = 0
-        with path.open('r') as file:
-            for line in file:
-                try:
-                    if line.find(self._noticesLines[linesFound]) >= 0:
-                        linesFound += 1
-                        # print(linesFound, line)
-                except IndexError:
-                    # By now, linesFound is one more than the index of the last
-                    # line in the notices. That happens to be the same as the
-                    # number of lines in the notices.
-                    return True, linesFound
-
-        return False, linesFound
+        # Search the whole file for each notice line in turn, starting where
+        # the previous notice line ended. That way the notices must appear in
+        # order, and each one is found by a single find() call. The file is
+        # read in binary, so there's no decoding or newline translation.
+        with path.open('rb') as file:
+            data = file.read()
+        position = 0
+        for linesFound, noticesBytes in enumerate(self._noticesBytes):
+            index = data.find(noticesBytes, position)
+            if index < 0:
+                return False, linesFound
+            position = index + len(noticesBytes)
+
+        return True, len(self._noticesBytes)
 
     @staticmethod
     def _effective_suffix(path):
@@ -304,17 +460,11 @@ class NoticesEditor:
         originalPath = Path(originalPath)
         suffix = self._effective_suffix(originalPath)
 
-        try:
-            customEditorName = self._custom_suffixes_map[suffix]
-            # Next line sets customEditor to the bound method.
-            customEditor = getattr(self, customEditorName)
-        except KeyError:
-            customEditor = None
-
-        for key, suffixList in self._leader_suffixes_map.items():
-            if suffix in suffixList:
-                commentLead = key
-                break
+        customEditor = self._custom_editors.get(suffix)
+        commentLead = self._suffix_to_lead.get(suffix)
+        if customEditor is None and commentLead is None:
+            # No way to insert notices in this type of file.
+            return None, None
 
         with NamedTemporaryFile(
                 mode='wt', delete=False
@@ -328,7 +478,7 @@ class NoticesEditor:
             else:
                 customEditor(originalFile, editedFile)
 
-        return editedPath, self._editor_differences(originalPath, editedPath)
+        return editedPath, _LazyDiff(self._readLines, originalPath, editedPath)
     
     # Simple editor that inserts the notices at the start of the file.
     #
@@ -337,25 +487,19 @@ class NoticesEditor:
     # line is inserted after the notice lines.  
     # Then append the rest of the original file.
     def _leader_editor(self, commentLead, originalFile, editedFile):
-        for line in self._noticesLines:
-            editedFile.write(commentLead)
-            editedFile.write(" ")
-            editedFile.write(line)
-            editedFile.write("\n")
+        header = ''.join(
+            f'{commentLead} {line}\n' for line in self._noticesLines)
 
-        for index, line in enumerate(originalFile):
-            if index == 0 and line.strip() != "":
-                editedFile.write("\n")
-            editedFile.write(line)
+        line = originalFile.readline()
+        if line.strip() != "":
+            header += "\n"
+        editedFile.write(header)
+        editedFile.write(line)
+        shutil.copyfileobj(originalFile, editedFile, 65536)
     
-    def _editor_differences(self, originalPath, editedPath):
-        with originalPath.open() as file: originalLines = file.readlines()
-        with editedPath.open() as file: editedLines = file.readlines()
-
-        return [diff for diff in context_diff(
-            originalLines, editedLines,
-            fromfile=str(originalPath), tofile="Edited"
-        )]
+    @staticmethod
+    def _read_lines_uncached(path):
+        with path.open() as file: return file.readlines()
 
     # Custom editor for XML files.
     #
@@ -375,10 +519,7 @@ class NoticesEditor:
         else:
             editedFile.write(self._noticesXML)
             editedFile.write(line)
-        line = originalFile.readline()
-        while line != '':
-            editedFile.write(line)
-            line = originalFile.readline()
+        shutil.copyfileobj(originalFile, editedFile, 65536)
 
         # Following code would do something more fancy. It looks for the first
         # end tag, `>` character, and then inserts the notice XML comment after
@@ -475,15 +616,26 @@ class DuplicatorJob:
     # End of CLI propperties.
 
     def __call__(self):
+        # Start each job without comparisons left over from an earlier one.
+        filecmp.clear_cache()
         self._rules = Rules(self._topPath)
+        # Lines of files that have been read, keyed by resolved path. Files that
+        # match more than one pattern are only read once per run.
+        self._linesCache = {}
         self._noticesEditor = (
-            NoticesEditor(self._noticesPath) if self.insertNotices else None)
+            NoticesEditor(self._noticesPath, self._read_lines)
+            if self.insertNotices else None)
 
         if self.find:
             return self._find_business()
 
+        if self.insertNotices:
+            self._load_notice_cache()
+
         originalsChecked = 0
         edited = 0
+        # Cache keys of every file in Git, if all of them are checked.
+        tracked = None
         for original in self._specified_originals():
             originalsChecked += 1
             if self.insertNotices:
@@ -493,15 +645,96 @@ class DuplicatorJob:
 
         if originalsChecked == 0:
             if self.insertNotices:
+                tracked = set()
                 for path in self.git_ls_files():
                     originalsChecked += 1
+                    tracked.add(self._notice_cache_key(path))
                     edited += self._notices_business(path)
             else:
                 self.diff_all()
 
         if self.insertNotices:
+            self._save_notice_cache(tracked)
             print(f"Checked:{originalsChecked}. Edited:{edited}.")
         return 0
+
+    # Notice check cache.
+    #
+    # Results of notice checks that passed are kept in a file at the top of the
+    # tree, so that a later run can skip checking files that haven't changed.
+    # Each entry maps a path, relative to the top with / separators like a Git
+    # name, to its modification time in nanoseconds, its size, and the number
+    # of notice lines found. After a run that checks every file in Git, entries
+    # for paths that Git no longer lists are dropped when the cache is saved. A
+    # run that checks only specified files doesn't drop any entries. The notices
+    # are stored too, and the whole cache is discarded if they've changed.
+    #
+    # The cache is only saved if it changed, and never in counting mode, which
+    # doesn't edit anything. Failure to save it doesn't fail the run.
+    _noticeCacheName = ".samers_cache.json"
+
+    def _load_notice_cache(self):
+        self._noticeCachePath = Path(self.top, self._noticeCacheName)
+        self._noticeCache = {}
+        self._noticeCacheChanged = False
+        try:
+            with self._noticeCachePath.open() as file:
+                cache = json.load(file)
+            files = cache["files"]
+            if (
+                cache["notices"] == self._noticesEditor.noticesLines
+                and isinstance(files, dict)
+            ):
+                self._noticeCache = {
+                    key: entry for key, entry in files.items()
+                    if isinstance(entry, list) and len(entry) == 3
+                }
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, unreadable, or not in the expected format. Start again.
+            pass
+
+    def _save_notice_cache(self, tracked):
+        if self.counting:
+            return
+
+        if tracked is not None:
+            for key in tuple(self._noticeCache):
+                if key not in tracked:
+                    del self._noticeCache[key]
+                    self._noticeCacheChanged = True
+
+        if not self._noticeCacheChanged:
+            return
+        try:
+            with self._noticeCachePath.open('w') as file:
+                json.dump({
+                    "notices": self._noticesEditor.noticesLines,
+                    "files": self._noticeCache
+                }, file)
+        except OSError:
+            # Read-only tree, for example. The next run checks everything.
+            pass
+
+    # Key is the same however the top was specified, and the same for a path
+    # from git ls-files as for a path specified on the command line.
+    def _notice_cache_key(self, path):
+        return Path(os.path.relpath(path, self.top)).as_posix()
+
+    def _check_notices(self, path):
+        stat = path.stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        key = self._notice_cache_key(path)
+        cached = self._noticeCache.get(key)
+        if cached is not None and cached[:2] == signature:
+            return True, cached[2]
+
+        noticeOK, linesFound = self._noticesEditor.check(path)
+        if noticeOK:
+            self._noticeCache[key] = [*signature, linesFound]
+            self._noticeCacheChanged = True
+        elif self._noticeCache.pop(key, None) is not None:
+            self._noticeCacheChanged = True
+        return noticeOK, linesFound
     
     def _find_business(self):
         modifiedPaths = tuple(path for path in self.git_ls_files('--modified'))
@@ -538,7 +771,7 @@ class DuplicatorJob:
         if path.is_dir():
             return
         
-        noticeOK, linesFound = self._noticesEditor.check(path)
+        noticeOK, linesFound = self._check_notices(path)
 
         if noticeOK:
             if self.verbose:
@@ -556,10 +789,15 @@ class DuplicatorJob:
             return 1
 
         editedPath, differences = self._noticesEditor.insert(path)
+        if editedPath is None:
+            print(
+                f'No notice insertion for suffix "{path.suffix}",'
+                f' not editing "{path}"')
+            return 0
         overwritten = self._ask_overwrite(editedPath, path, differences)
 
         if overwritten:
-            noticeOK, linesFound = self._noticesEditor.check(path)
+            noticeOK, linesFound = self._check_notices(path)
             if noticeOK:
                 if self.verbose:
                     print('Overwritten file OK.')
@@ -572,21 +810,64 @@ class DuplicatorJob:
         # See: https://git-scm.com/docs/git-ls-files  
         # -z switch specifies null-terminators instead of newlines, and verbatim
         # file names for unprintable values.
-        with subprocess.Popen(
+        #
+        # Output is captured whole, in binary, and split on the null
+        # terminators.
+        gitOutput = subprocess.run(
             ('git', 'ls-files', '-z', *switches)
-            ,stdout=subprocess.PIPE, text=True, cwd=self.top
-        ) as gitProcess:
-            with gitProcess.stdout as gitOutput:
-                name = []
-                while True:
-                    readChar = gitOutput.read(1)
-                    if readChar == "":
-                        return
-                    if readChar == "\x00":
-                        yield Path(self.top, ''.join(name))
-                        name = []
-                    else:
-                        name.append(readChar)
+            ,stdout=subprocess.PIPE, cwd=self.top, check=True
+        ).stdout
+        for name in gitOutput.split(b'\x00'):
+            if name:
+                yield Path(self.top, os.fsdecode(name))
+
+    def _read_lines(self, path):
+        key = path.resolve()
+        lines = self._linesCache.get(key)
+        if lines is None:
+            with path.open() as file:
+                lines = file.readlines()
+            self._linesCache[key] = lines
+        return lines
+
+    def _forget_lines(self, path):
+        self._linesCache.pop(Path(path).resolve(), None)
+
+    def diff_each(self, paths, pathLeft=None):
+
+        linesLeft = None
+        for path in paths:
+            if pathLeft is None:
+                pathLeft = path
+                continue
+            
+            if path == pathLeft:
+                continue
+            
+            # Most files are the same, in which case there's no need to run
+            # context_diff, which is slow on large inputs. Byte comparison is
+            # quickest and doesn't read any lines. Files that differ only in
+            # line endings are caught by comparing the lines.
+            if filecmp.cmp(pathLeft, path, shallow=False):
+                yield pathLeft, path, None
+                continue
+
+            if linesLeft is None:
+                linesLeft = self._read_lines(pathLeft)
+            lines = self._read_lines(path)
+            if lines == linesLeft:
+                yield pathLeft, path, None
+                continue
+
+            # The differences are yielded as a generator, not a list, so that
+            # the caller decides whether to keep them. Only the first one is
+            # generated here, to tell whether there are any.
+            differences = context_diff(
+                linesLeft, lines, fromfile=str(pathLeft), tofile=str(path))
+            first = next(differences, None)
+            
+            yield pathLeft, path, (
+                None if first is None else chain((first,), differences))
 
     def process_original(self, original):
         originalPath = Path(original)
@@ -597,8 +878,8 @@ class DuplicatorJob:
             matchCount += 1
             print(f'{original}\nMatches {description}:')
             try:
-                for pathLeft, path, differences in diff_each(
-                    glob_each(self._topPath, patterns), originalPath
+                for pathLeft, path, differences in self.diff_each(
+                    self._rules.glob_each(patterns), originalPath
                 ):
                     self._ask_overwrite(pathLeft, path, differences)
             except ValueError as error:
@@ -607,68 +888,102 @@ class DuplicatorJob:
         if matchCount <= 0:
             print(f'{original}\nNo matches.')
     
+    def _overwrite(self, pathSource, pathDestination):
+        print('Overwriting.')
+        # Only the contents are copied, not the permissions. Destinations are
+        # source files in Git, so they already have the right permissions. The
+        # source could be a temporary file, which would have restrictive ones.
+        shutil.copyfile(pathSource, pathDestination)
+        self._forget_lines(pathDestination)
+
     def _ask_overwrite(self, pathSource, pathDestination, differences):
         if differences is None:
             print(f'    Same "{pathDestination}"')
             return None
 
+        # Differences could be a generator, so make a list before printing
+        # them, in case they're printed again.
         print(f'    Different "{pathDestination}"')
         if self.verbose:
+            differences = list(differences)
             print(''.join(differences))
 
+        if self.yes:
+            self._overwrite(pathSource, pathDestination)
+            return True
+
         while True:
-            response = (
-                "yes" if self.yes else input('    Overwrite? (Y/n/?)').lower())
+            response = input('    Overwrite? (Y/n/?)').lower()
             if response == "" or response.startswith("y"):
-                print('Overwriting.')
-                shutil.copy(pathSource, pathDestination)
+                self._overwrite(pathSource, pathDestination)
                 return True
             elif response.startswith("n"):
                 print('Keeping')
                 return False
             elif response == "?":
+                differences = list(differences)
                 print(''.join(differences))
             else:
                 print(f'Unrecognised "{response}". Ctrl-C to quit.')
     
+    def _diff_group(self, paths):
+        pathsFound = None
+        pathDifferences = []
+        lineDifferences = []
+        for pathLeft, path, differences in self.diff_each(paths):
+            if pathsFound is None:
+                pathsFound = [pathLeft]
+            pathsFound.append(path)
+            if differences is not None:
+                pathDifferences.append(str(path))
+                lineDifferences.extend(differences)
+        return pathsFound, pathDifferences, lineDifferences
+
     def diff_all(self, report=sys.stdout):
-        for description, paths in self._rules.named_globs():
-            pathsFound = None
-            pathDifferences = []
-            lineDifferences = []
+        # Each pattern group is diffed in a worker thread, so that file reads
+        # overlap. Results are still reported in the order of the groups.
+        with ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4)
+        ) as executor:
+            groups = [
+                (description, executor.submit(self._diff_group, paths))
+                for description, paths in self._rules.named_globs()
+            ]
+            out = []
+            self._report_groups(groups, out)
+        report.write(''.join(out))
+
+    # Append the report text for each group, in order, to the out list. The
+    # caller writes it all in one call.
+    def _report_groups(self, groups, out):
+        for description, group in groups:
             try:
-                for pathLeft, path, differences in diff_each(paths):
-                    if pathsFound is None:
-                        pathsFound = [pathLeft]
-                    pathsFound.append(path)
-                    if differences is not None:
-                        pathDifferences.append(str(path))
-                        lineDifferences.extend(differences)
+                pathsFound, pathDifferences, lineDifferences = group.result()
             except ValueError as error:
                 # ToDo sort this out a bit better. Right now, the code gets here
                 # if a sub-pattern matches zero or one items. That's different
                 # to a "main" pattern matching zero or one items.
-                report.write(str(error))
-                report.write("\n")
+                out.append(str(error))
+                out.append("\n")
                 continue
 
             pathCount = 0 if pathsFound is None else len(pathsFound)
             if pathCount <= 0:
-                report.write(f'Failed, no match for {description}.\n')
+                out.append(f'Failed, no match for {description}.\n')
             elif pathCount < 2:
-                report.write(
+                out.append(
                     f'Failed, only one match for {description}:'
                     f' "{pathsFound}"\n')
             elif len(pathDifferences) > 0:
-                report.write(f'Differences {description} "{pathsFound[0]}"\n')
+                out.append(f'Differences {description} "{pathsFound[0]}"\n')
                 if self.verbose:
                     for difference in lineDifferences:
-                        report.write("    " + difference)
+                        out.append("    " + difference)
                 else:
                     for difference in pathDifferences:
-                        report.write(f'    "{difference}"\n')
+                        out.append(f'    "{difference}"\n')
             else:
-                report.write(f'OK {pathCount:>2} matches for {description}.\n')
+                out.append(f'OK {pathCount:>2} matches for {description}.\n')
 
 def main(commandLine):
     argumentParser = argparse.ArgumentParser(